@@ -0,0 +1,42 @@
+from django.utils.functional import SimpleLazyObject
+
+from apps.dashboard.models import Category
+
+from .models import Account
+
+_CHOICE_QUERIES = {
+    "accounts": lambda user: Account.objects.filter(user=user).only(
+        "id", "name", "balance", "is_active"
+    ),
+    "expense_categories": lambda user: Category.objects.filter(
+        user=user, category_type="expense"
+    ).only("id", "name"),
+    "income_categories": lambda user: Category.objects.filter(
+        user=user, category_type="income"
+    ).only("id", "name"),
+}
+
+
+def user_choices(request, kind):
+    """Dropdown options of one kind for request.user, fetched once per request."""
+    choices = request.__dict__.setdefault("_user_choices", {})
+    if kind not in choices:
+        choices[kind] = list(_CHOICE_QUERIES[kind](request.user))
+    return choices[kind]
+
+
+def user_sidebar(request):
+    # Lazy, so pages that never show a dropdown run no queries for it
+    if not request.user.is_authenticated:
+        return {}
+    return {
+        "user_accounts": SimpleLazyObject(
+            lambda: [acc for acc in user_choices(request, "accounts") if acc.is_active]
+        ),
+        "expense_categories": SimpleLazyObject(
+            lambda: user_choices(request, "expense_categories")
+        ),
+        "income_categories": SimpleLazyObject(
+            lambda: user_choices(request, "income_categories")
+        ),
+    }
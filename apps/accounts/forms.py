@@ -1,9 +1,80 @@
+from decimal import Decimal
+
+from django import forms
 from django.forms import ModelForm
 
+from .models import Account, Contact, Debt
 
-class AccountForm(ModelForm):
-    class Meta:
-        from .models import Account
 
+class FirstErrorMixin:
+    def first_error(self):
+        name, errors = next(iter(self.errors.items()))
+        if name in self.fields:
+            return f"{self[name].label}: {errors[0]}"
+        return errors[0]
+
+
+class AccountForm(FirstErrorMixin, ModelForm):
+    class Meta:
         model = Account
         fields = ["name", "account_type", "balance", "currency", "is_active"]
+
+    def __init__(self, *args, **kwargs):
+        """Let the opening balance be left blank, as the dashboard form allows."""
+        super().__init__(*args, **kwargs)
+        self.fields["balance"].required = False
+
+    def clean_balance(self):
+        return self.cleaned_data["balance"] or Decimal(0)
+
+
+class UserScopedForm(FirstErrorMixin, forms.Form):
+    def __init__(self, *args, user, **kwargs):
+        """Limit every ModelChoiceField on the form to rows owned by ``user``."""
+        super().__init__(*args, **kwargs)
+        self.user = user
+        for field in self.fields.values():
+            if isinstance(field, forms.ModelChoiceField):
+                field.queryset = field.queryset.filter(user=user)
+
+
+class TransferForm(UserScopedForm):
+    # Plain ids, resolved together in clean() so both accounts cost one query
+    from_account = forms.IntegerField()
+    to_account = forms.IntegerField()
+    amount = forms.DecimalField(
+        max_digits=12, decimal_places=2, min_value=Decimal("0.01")
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        from_id = cleaned_data.get("from_account")
+        to_id = cleaned_data.get("to_account")
+        if from_id is None or to_id is None:
+            return cleaned_data
+        if from_id == to_id:
+            raise forms.ValidationError("Cannot transfer to the same account.")
+
+        accounts = Account.objects.filter(user=self.user).in_bulk([from_id, to_id])
+        if len(accounts) != 2:
+            raise forms.ValidationError("Select a valid account.")
+        cleaned_data["from_account"] = accounts[from_id]
+        cleaned_data["to_account"] = accounts[to_id]
+        return cleaned_data
+
+
+class DebtForm(UserScopedForm):
+    contact = forms.ModelChoiceField(queryset=Contact.objects.all())
+    account = forms.ModelChoiceField(queryset=Account.objects.all())
+    amount = forms.DecimalField(
+        max_digits=12, decimal_places=2, min_value=Decimal("0.01")
+    )
+    debt_type = forms.ChoiceField(choices=Debt.DEBT_TYPE)
+
+
+class DebtPaymentForm(UserScopedForm):
+    debt_id = forms.ModelChoiceField(queryset=Debt.objects.all())
+    account = forms.ModelChoiceField(queryset=Account.objects.all())
+    amount = forms.DecimalField(
+        max_digits=12, decimal_places=2, min_value=Decimal("0.01")
+    )
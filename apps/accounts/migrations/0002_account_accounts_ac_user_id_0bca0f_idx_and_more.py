@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-15 09:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['user', 'is_active'], name='accounts_ac_user_id_0bca0f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='debt',
+            index=models.Index(fields=['user', 'is_settled', 'debt_type'], name='accounts_de_user_id_55341f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transfer',
+            index=models.Index(fields=['user', '-timestamp'], name='accounts_tr_user_id_47c967_idx'),
+        ),
+    ]
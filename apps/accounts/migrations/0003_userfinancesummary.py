@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 10:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_account_accounts_ac_user_id_0bca0f_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserFinanceSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unsettled_receivable_total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('unsettled_payable_total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='finance_summary', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
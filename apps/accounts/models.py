@@ -1,10 +1,41 @@
 from decimal import Decimal
+from functools import partial
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models, transaction  # noqa: D100
+from django.db.models import Case, F, Q, Sum, When
 
 from apps.dashboard.models import Category
+from apps.dashboard.utils import list_count_cache_key
+
+# Cached per-user balance/debt figures, busted whenever a balance or debt changes
+DASHBOARD_CACHE_TIMEOUT = 300
+
+
+def dashboard_cache_key(user_id):
+    return f"acct_dash:{user_id}"
+
+
+def summary_cache_key(user_id):
+    return f"fin_summary:{user_id}"
+
+
+def clear_finance_cache(user_id):
+    # Deferred to commit: clearing earlier lets a concurrent read re-cache the
+    # pre-write figures. Runs immediately when no transaction is open.
+    keys = [
+        dashboard_cache_key(user_id),
+        summary_cache_key(user_id),
+        list_count_cache_key(user_id),
+    ]
+    transaction.on_commit(partial(cache.delete_many, keys))
+
+
+def as_decimal(value):
+    # Callers usually pass a DecimalField value already; only convert the rest
+    return value if isinstance(value, Decimal) else Decimal(str(value))
 
 
 # --- 1. Account Model ---
@@ -27,23 +58,33 @@ class Account(models.Model):
 
     class Meta:
         unique_together = ("user", "name")
+        indexes = [models.Index(fields=["user", "is_active"])]
 
     def __str__(self):
         return f"{self.name} - {self.balance}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        clear_finance_cache(self.user_id)
+
+    # Balance changes are applied with F() so the database does the arithmetic
+    # in a single UPDATE; concurrent writers can't overwrite each other.
     def deposit(self, amount):
-        self.balance += Decimal(str(amount))
-        self.save()
+        de_amount = as_decimal(amount)
+        Account.objects.filter(pk=self.pk).update(balance=F("balance") + de_amount)
+        self.refresh_from_db(fields=["balance"])
+        clear_finance_cache(self.user_id)
 
     def withdraw(self, amount):
-        de_balance = Decimal(str(self.balance))
-        de_amount = Decimal(str(amount))
-        if de_balance < de_amount:
+        de_amount = as_decimal(amount)
+        updated = Account.objects.filter(pk=self.pk, balance__gte=de_amount).update(
+            balance=F("balance") - de_amount
+        )
+        if not updated:
             raise ValidationError(f"Insufficient funds in {self.name}.")
 
-        de_balance -= de_amount
-        self.balance = de_balance
-        self.save()
+        self.refresh_from_db(fields=["balance"])
+        clear_finance_cache(self.user_id)
 
 
 class Contact(models.Model):
@@ -88,11 +129,32 @@ class Transfer(models.Model):
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "-timestamp"])]
+
     def save(self, *args, **kwargs):
         with transaction.atomic():
             if not self.pk:
-                self.from_account.withdraw(self.amount)
-                self.to_account.deposit(self.amount)
+                amount = as_decimal(self.amount)
+                # Move both balances in one UPDATE; the source row drops out of
+                # the match when it can't cover the amount.
+                updated = (
+                    Account.objects.filter(
+                        pk__in=[self.from_account_id, self.to_account_id]
+                    )
+                    .exclude(pk=self.from_account_id, balance__lt=amount)
+                    .update(
+                        balance=Case(
+                            When(pk=self.from_account_id, then=F("balance") - amount),
+                            default=F("balance") + amount,
+                        )
+                    )
+                )
+                if updated != 2:
+                    raise ValidationError(
+                        f"Insufficient funds in {self.from_account.name}."
+                    )
+                clear_finance_cache(self.user_id)
             super().save(*args, **kwargs)
 
 
@@ -112,6 +174,9 @@ class Debt(models.Model):
     is_settled = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "is_settled", "debt_type"])]
+
     def save(self, *args, **kwargs):
         with transaction.atomic():
             if not self.pk:
@@ -122,7 +187,11 @@ class Debt(models.Model):
                 # If I lend (receivable), my cash goes DOWN
                 else:
                     self.account.withdraw(self.initial_amount)
+                UserFinanceSummary.adjust(
+                    self.user_id, self.debt_type, self.initial_amount
+                )
             super().save(*args, **kwargs)
+        clear_finance_cache(self.user_id)
 
 
 class DebtPayment(models.Model):
@@ -133,6 +202,9 @@ class DebtPayment(models.Model):
 
     def save(self, *args, **kwargs):
         with transaction.atomic():
+            # Lock the debt row so two concurrent payments can't both pass the
+            # remaining-balance check against the same stale value.
+            self.debt = Debt.objects.select_for_update().get(pk=self.debt_id)
             if self.amount_paid > self.debt.remaining_amount:
                 raise ValidationError("Payment amount exceeds remaining debt balance.")
 
@@ -140,7 +212,10 @@ class DebtPayment(models.Model):
             self.debt.remaining_amount -= self.amount_paid
             if self.debt.remaining_amount == 0:
                 self.debt.is_settled = True
-            self.debt.save()
+            self.debt.save(update_fields=["remaining_amount", "is_settled"])
+            UserFinanceSummary.adjust(
+                self.debt.user_id, self.debt.debt_type, -self.amount_paid
+            )
 
             # Update Account balance
             if self.debt.debt_type == "payable":
@@ -151,3 +226,51 @@ class DebtPayment(models.Model):
                 self.account.deposit(self.amount_paid)
 
             super().save(*args, **kwargs)
+
+
+class UserFinanceSummary(models.Model):
+    # Running totals of unsettled debts, kept in step by Debt/DebtPayment saves
+    # so dashboards read one row instead of summing every debt.
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="finance_summary",
+    )
+    unsettled_receivable_total = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0
+    )
+    unsettled_payable_total = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0
+    )
+
+    def __str__(self):
+        return f"{self.user} - summary"
+
+    @staticmethod
+    def _field_for(debt_type):
+        if debt_type == "receivable":
+            return "unsettled_receivable_total"
+        return "unsettled_payable_total"
+
+    @classmethod
+    def for_user(cls, user):
+        summary = cls.objects.filter(user=user).first()
+        if summary is None:
+            # First read for this user: seed the row from the existing debts
+            totals = Debt.objects.filter(user=user, is_settled=False).aggregate(
+                receivable=Sum("remaining_amount", filter=Q(debt_type="receivable")),
+                payable=Sum("remaining_amount", filter=Q(debt_type="payable")),
+            )
+            summary, _ = cls.objects.get_or_create(
+                user=user,
+                defaults={
+                    "unsettled_receivable_total": totals["receivable"] or 0,
+                    "unsettled_payable_total": totals["payable"] or 0,
+                },
+            )
+        return summary
+
+    @classmethod
+    def adjust(cls, user_id, debt_type, amount):
+        field = cls._field_for(debt_type)
+        cls.objects.filter(user_id=user_id).update(**{field: F(field) + amount})
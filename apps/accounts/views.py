@@ -1,16 +1,70 @@
 from decimal import Decimal
 
-import pandas as pd
-import plotly.express as px
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.db import transaction
-from django.db.models import F, Sum
+from django.db.models import F
 from django.shortcuts import get_object_or_404, redirect, render
-from plotly.offline import plot
 
-from .forms import AccountForm
-from .models import Account, Contact, Debt, DebtPayment, Transfer
+from .forms import AccountForm, DebtForm, DebtPaymentForm, TransferForm
+from .models import (
+    DASHBOARD_CACHE_TIMEOUT,
+    Account,
+    Contact,
+    Debt,
+    DebtPayment,
+    Transfer,
+    UserFinanceSummary,
+    dashboard_cache_key,
+)
+
+
+def _get_account_metrics(user, accounts):
+    # Already loaded for the template, so sum in Python instead of a second query
+    total_balance = sum((acc.balance for acc in accounts), Decimal(0))
+
+    # Debt Metrics
+    summary = UserFinanceSummary.for_user(user)
+    receivables = summary.unsettled_receivable_total
+    payables = summary.unsettled_payable_total
+    net_worth = (total_balance + receivables) - payables
+
+    # Chart: Balance Distribution (rendered client-side from the figure JSON)
+    chart_wealth_json = ""
+    # Only plot accounts with money
+    funded = [(acc.name, float(acc.balance)) for acc in accounts if acc.balance > 0]
+    if funded:
+        import plotly.graph_objects as go
+        from plotly.colors import qualitative
+
+        names, values = zip(*funded, strict=True)
+        fig = go.Figure(
+            go.Pie(
+                labels=names,
+                values=values,
+                hole=0.5,
+                marker=dict(colors=qualitative.Pastel),
+            )
+        )
+        fig.update_layout(
+            showlegend=True,
+            legend=dict(
+                orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5
+            ),
+            margin=dict(t=0, b=0, l=0, r=0),
+            height=300,
+        )
+        chart_wealth_json = fig.to_json()
+
+    return {
+        "total_balance": total_balance,
+        "receivables": receivables,
+        "payables": payables,
+        "net_worth": net_worth,
+        "chart_wealth_json": chart_wealth_json,
+    }
 
 
 @login_required
@@ -24,87 +78,52 @@ def accounts_dashboard(request):
         try:
             with transaction.atomic():
                 if action == "create_account":
-                    Account.objects.create(
-                        user=user,
-                        name=request.POST.get("name"),
-                        account_type=request.POST.get("account_type"),
-                        balance=Decimal(request.POST.get("balance") or 0),
-                    )
-                    messages.success(request, "Account created successfully.")
+                    form = AccountForm(request.POST)
+                    if form.is_valid():
+                        account = form.save(commit=False)
+                        account.user = user
+                        account.save()
+                        messages.success(request, "Account created successfully.")
+                    else:
+                        messages.error(request, form.first_error())
 
                 elif action == "transfer_money":
-                    from_acc = get_object_or_404(
-                        Account, id=request.POST.get("from_account"), user=user
-                    )
-                    to_acc = get_object_or_404(
-                        Account, id=request.POST.get("to_account"), user=user
-                    )
-                    amount = Decimal(request.POST.get("amount") or 0)
-
-                    if from_acc == to_acc:
-                        messages.error(request, "Cannot transfer to the same account.")
-                    else:
+                    form = TransferForm(request.POST, user=user)
+                    if form.is_valid():
+                        amount = form.cleaned_data["amount"]
                         Transfer.objects.create(
                             user=user,
-                            from_account=from_acc,
-                            to_account=to_acc,
+                            from_account=form.cleaned_data["from_account"],
+                            to_account=form.cleaned_data["to_account"],
                             amount=amount,
                         )
                         messages.success(
                             request, f"Transferred NPR {amount} successfully."
                         )
+                    else:
+                        messages.error(request, form.first_error())
             return redirect("accounts_dashboard")
         except Exception as e:
             messages.error(request, f"Error: {str(e)}")
 
     # --- 2. METRICS & DATA ---
-    accounts = Account.objects.filter(user=user, is_active=True).order_by("-balance")
-    total_balance = accounts.aggregate(Sum("balance"))["balance__sum"] or Decimal(0)
-
-    # Debt Metrics
-    receivables = Debt.objects.filter(
-        user=user, debt_type="receivable", is_settled=False
-    ).aggregate(Sum("remaining_amount"))["remaining_amount__sum"] or Decimal(0)
-    payables = Debt.objects.filter(
-        user=user, debt_type="payable", is_settled=False
-    ).aggregate(Sum("remaining_amount"))["remaining_amount__sum"] or Decimal(0)
-    net_worth = (total_balance + receivables) - payables
-
-    # --- 3. CHART: BALANCE DISTRIBUTION ---
-    chart_wealth = ""
-    if accounts.exists():
-        df = pd.DataFrame(list(accounts.values("name", "balance")))
-        df["balance"] = df["balance"].astype(float)
-        df = df[df["balance"] > 0]  # Only plot accounts with money
-
-        if not df.empty:
-            fig = px.pie(
-                df,
-                values="balance",
-                names="name",
-                hole=0.5,
-                color_discrete_sequence=px.colors.qualitative.Pastel,
-            )
-            fig.update_layout(
-                showlegend=True,
-                legend=dict(
-                    orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5
-                ),
-                margin=dict(t=0, b=0, l=0, r=0),
-                height=300,
-            )
-            chart_wealth = plot(fig, output_type="div", include_plotlyjs=True)
+    accounts = list(
+        Account.objects.filter(user=user, is_active=True)
+        .only("id", "name", "account_type", "balance")
+        .order_by("-balance")
+    )
+    metrics = cache.get_or_set(
+        dashboard_cache_key(user.id),
+        lambda: _get_account_metrics(user, accounts),
+        DASHBOARD_CACHE_TIMEOUT,
+    )
 
     context = {
         "accounts": accounts,
-        "total_balance": total_balance,
-        "receivables": receivables,
-        "payables": payables,
-        "net_worth": net_worth,
-        "chart_wealth": chart_wealth,
-        "recent_transfers": Transfer.objects.filter(user=user).order_by("-timestamp")[
-            :5
-        ],
+        **metrics,
+        "recent_transfers": Transfer.objects.filter(user=user)
+        .select_related("from_account", "to_account")
+        .order_by("-timestamp")[:5],
         "account_types": Account.TYPE_CHOICES,
     }
     return render(request, "accounts/accounts_dashboard.html", context)
@@ -142,7 +161,7 @@ def account_delete(request, pk):
     account = get_object_or_404(Account, pk=pk, user=request.user)
     if request.method == "POST":
         account.is_active = False
-        account.save()
+        account.save(update_fields=["is_active"])
         return redirect("account_list")
     return render(request, "accounts/account_confirm_delete.html", {"account": account})
 
@@ -156,22 +175,21 @@ def account_detail(request, pk):
 @login_required
 def process_transfer(request):
     if request.method == "POST":
-        from_id = request.POST.get("from_account")
-        to_id = request.POST.get("to_account")
-        amount = request.POST.get("amount")
-
-        if from_id == to_id:
-            # Add error message here
-            messages.error(request, "Cannot transfer to the same account.")
+        form = TransferForm(request.POST, user=request.user)
+        if not form.is_valid():
+            messages.error(request, form.first_error())
             return redirect("accounts_dashboard")
 
-        Transfer.objects.create(
-            user=request.user,
-            from_account_id=from_id,
-            to_account_id=to_id,
-            amount=amount,
-        )
-        messages.success(request, "Transfer completed successfully.")
+        try:
+            Transfer.objects.create(
+                user=request.user,
+                from_account=form.cleaned_data["from_account"],
+                to_account=form.cleaned_data["to_account"],
+                amount=form.cleaned_data["amount"],
+            )
+            messages.success(request, "Transfer completed successfully.")
+        except ValidationError as e:
+            messages.error(request, f"Error: {e.message}")
         return redirect("accounts_dashboard")
 
 
@@ -193,29 +211,34 @@ def debt_dashboard(request):
 
                 elif action == "add_debt":
                     # Initial Debt Creation (Borrow or Lend)
-                    Debt.objects.create(
-                        user=user,
-                        contact_id=request.POST.get("contact"),
-                        account_id=request.POST.get("account"),
-                        initial_amount=Decimal(request.POST.get("amount")),
-                        debt_type=request.POST.get("debt_type"),
-                        is_settled=False,
-                    )
-                    messages.success(
-                        request, "Debt record created and account balance updated."
-                    )
+                    form = DebtForm(request.POST, user=user)
+                    if form.is_valid():
+                        Debt.objects.create(
+                            user=user,
+                            contact=form.cleaned_data["contact"],
+                            account=form.cleaned_data["account"],
+                            initial_amount=form.cleaned_data["amount"],
+                            debt_type=form.cleaned_data["debt_type"],
+                            is_settled=False,
+                        )
+                        messages.success(
+                            request, "Debt record created and account balance updated."
+                        )
+                    else:
+                        messages.error(request, form.first_error())
 
                 elif action == "make_payment":
                     # Reducing an existing Debt
-                    debt_obj = get_object_or_404(
-                        Debt, id=request.POST.get("debt_id"), user=user
-                    )
-                    DebtPayment.objects.create(
-                        debt=debt_obj,
-                        account_id=request.POST.get("account"),
-                        amount_paid=Decimal(request.POST.get("amount")),
-                    )
-                    messages.success(request, "Payment recorded successfully.")
+                    form = DebtPaymentForm(request.POST, user=user)
+                    if form.is_valid():
+                        DebtPayment.objects.create(
+                            debt=form.cleaned_data["debt_id"],
+                            account=form.cleaned_data["account"],
+                            amount_paid=form.cleaned_data["amount"],
+                        )
+                        messages.success(request, "Payment recorded successfully.")
+                    else:
+                        messages.error(request, form.first_error())
 
             return redirect("debt_page")
         except Exception as e:
@@ -233,23 +256,12 @@ def debt_dashboard(request):
             remaining_amount=F("initial_amount"),
         )
 
-    all_active = Debt.objects.filter(user=user, is_settled=False)
-    total_receivable = (
-        all_active.filter(debt_type="receivable").aggregate(Sum("remaining_amount"))[
-            "remaining_amount__sum"
-        ]
-        or 0
-    )
-    total_payable = (
-        all_active.filter(debt_type="payable").aggregate(Sum("remaining_amount"))[
-            "remaining_amount__sum"
-        ]
-        or 0
-    )
+    summary = UserFinanceSummary.for_user(user)
+    total_receivable = summary.unsettled_receivable_total
+    total_payable = summary.unsettled_payable_total
 
     context = {
         "contacts": Contact.objects.filter(user=user),
-        "accounts": Account.objects.filter(user=user, is_active=True),
         "debts": debt_qs,  # This is the filtered list
         "total_receivable": total_receivable,
         "total_payable": total_payable,
@@ -0,0 +1,6 @@
+from .utils import plotly_js_url
+
+
+def plotly(request):
+    # base.html loads plotly.js once; chart views only render the figure divs
+    return {"plotly_js_url": plotly_js_url()}
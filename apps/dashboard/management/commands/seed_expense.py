@@ -2,8 +2,8 @@ import random
 from datetime import datetime, timedelta
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
-from expenses.models import Expense, Category
-from accounts.models import Account
+from apps.expenses.models import Expense, Category
+from apps.accounts.models import Account
 
 
 class Command(BaseCommand):
@@ -41,12 +41,19 @@ class Command(BaseCommand):
             "Bills",
             "Health",
         ]
-        expense_cat_objs = []
-        for name in expense_cats:
-            cat, _ = Category.objects.get_or_create(
-                user=user, name=name, category_type="expense"
+        # Existing (user, name, type) rows are skipped by the unique constraint
+        Category.objects.bulk_create(
+            [
+                Category(user=user, name=name, category_type="expense")
+                for name in expense_cats
+            ],
+            ignore_conflicts=True,
+        )
+        expense_cat_objs = list(
+            Category.objects.filter(
+                user=user, name__in=expense_cats, category_type="expense"
             )
-            expense_cat_objs.append(cat)
+        )
 
         # 4. Data Options
         expense_titles = [
@@ -65,15 +72,23 @@ class Command(BaseCommand):
 
         self.stdout.write("Seeding expenses...")
 
-        # 5. Create 50 Expense records
-        created_count = 0
-        for i in range(50):
+        # 5. Build 50 Expense records in memory
+        # Track the balance here so rows the account can't cover are skipped
+        # instead of failing the whole batch.
+        available = account.balance
+        expenses = []
+        skipped = 0
+        for _ in range(50):
             current_date = (start_date + timedelta(days=random.randint(1, 90))).date()
             amount = random.randint(150, 4500)
 
-            try:
-                # Removed 'payment_method' as it's no longer in your model
-                Expense.objects.create(
+            if amount > available:
+                skipped += 1
+                continue
+
+            available -= amount
+            expenses.append(
+                Expense(
                     user=user,
                     account=account,
                     category=random.choice(expense_cat_objs),
@@ -85,12 +100,20 @@ class Command(BaseCommand):
                     notes="Automated seed data",
                     is_active=True,
                 )
-                created_count += 1
-            except Exception as e:
-                self.stdout.write(self.style.WARNING(f"Skipped an expense: {e}"))
+            )
 
+        # 6. One INSERT for the rows, one UPDATE for the balance
+        Expense.bulk_create_with_withdraw(expenses, batch_size=500)
+
+        if skipped:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Skipped {skipped} expenses: Insufficient funds in {account.name}."
+                )
+            )
         self.stdout.write(
             self.style.SUCCESS(
-                f"Successfully seeded {created_count} expenses to account '{account.name}'!"
+                f"Successfully seeded {len(expenses)} expenses "
+                f"to account '{account.name}'!"
             )
         )
@@ -4,9 +4,11 @@ from decimal import Decimal
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from django.contrib.auth.models import User
-from income.models import Income
-from dashboard.models import Category
-from accounts.models import Account
+from django.db import transaction
+from django.db.models import F
+from apps.income.models import Income
+from apps.dashboard.models import Category
+from apps.accounts.models import Account
 
 
 class Command(BaseCommand):
@@ -30,12 +32,19 @@ class Command(BaseCommand):
 
         # 3. Get or Create Income Categories
         income_cats = ["Salary", "Freelancing", "Dividends", "Gifts", "Rental Income"]
-        category_objs = []
-        for cat_name in income_cats:
-            obj, _ = Category.objects.get_or_create(
-                user=user, name=cat_name, category_type="income"
+        # Existing (user, name, type) rows are skipped by the unique constraint
+        Category.objects.bulk_create(
+            [
+                Category(user=user, name=cat_name, category_type="income")
+                for cat_name in income_cats
+            ],
+            ignore_conflicts=True,
+        )
+        category_objs = list(
+            Category.objects.filter(
+                user=user, name__in=income_cats, category_type="income"
             )
-            category_objs.append(obj)
+        )
 
         # 4. Generate Data
         self.stdout.write("Seeding income data...")
@@ -48,26 +57,36 @@ class Command(BaseCommand):
         ]
 
         # Seed 30 random income entries over the last 90 days
-        for i in range(30):
+        incomes = []
+        for _ in range(30):
             random_days = random.randint(0, 90)
             date_received = timezone.now().date() - timedelta(days=random_days)
 
             # Use Decimal for financial precision
             amount = Decimal(random.randrange(500, 15000))
 
-            Income.objects.create(
-                user=user,
-                source=random.choice(sources),
-                account=account,
-                category=random.choice(category_objs),
-                amount=amount,
-                date_received=date_received,
-                notes="Automated seed data for testing charts.",
-                is_active=True,
+            incomes.append(
+                Income(
+                    user=user,
+                    source=random.choice(sources),
+                    account=account,
+                    category=random.choice(category_objs),
+                    amount=amount,
+                    date_received=date_received,
+                    notes="Automated seed data for testing charts.",
+                    is_active=True,
+                )
             )
 
+        # Saving an Income doesn't credit its account, so deposit the total here
+        total = sum(i.amount for i in incomes)
+        with transaction.atomic():
+            Income.objects.bulk_create(incomes, batch_size=500)
+            Account.objects.filter(pk=account.pk).update(balance=F("balance") + total)
+
         self.stdout.write(
             self.style.SUCCESS(
-                f"Successfully seeded 30 income records for {user.username}!"
+                f"Successfully seeded {len(incomes)} income records "
+                f"for {user.username}!"
             )
         )
@@ -36,8 +36,5 @@ class Category(models.Model):
         # Prevents a user from having two 'Food' categories for expenses
         unique_together = ("user", "name", "category_type")
 
-    def get_category_type_display(self):
-        return dict(self.CATEGORY_TYPES).get(self.category_type, "Unknown")
-
     def __str__(self):
         return f"{self.name} ({self.get_category_type_display()})"
@@ -0,0 +1,130 @@
+import hashlib
+from collections import defaultdict
+from datetime import date, timedelta
+from functools import cached_property, lru_cache
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Sum
+from django.db.models.expressions import RawSQL
+
+CHART_CACHE_TIMEOUT = 300
+LIST_COUNT_CACHE_TIMEOUT = 60
+
+
+def _month_start(day, months=0):
+    # First day of the month `months` away from day's month
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+# period key -> half-open [start, stop); stop=None leaves the range open.
+# Plain gte/lt bounds keep the (user, is_active, date) indexes usable, unlike
+# __year/__month lookups.
+PERIOD_BOUNDS = {
+    "last_week": lambda today: (today - timedelta(days=7), None),
+    "this_month": lambda today: (_month_start(today), _month_start(today, 1)),
+    "last_month": lambda today: (_month_start(today, -1), _month_start(today)),
+    "last_year": lambda today: (
+        date(today.year - 1, 1, 1),
+        date(today.year, 1, 1),
+    ),
+}
+
+
+def period_range(period, today):
+    """Return the [start, stop) bounds for a period key, or (None, None) for all."""
+    bounds = PERIOD_BOUNDS.get(period)
+    return bounds(today) if bounds else (None, None)
+
+
+def filter_period(queryset, field, start, stop):
+    """Restrict queryset to rows whose date field falls inside [start, stop)."""
+    if start is None:
+        return queryset
+    lookups = {f"{field}__gte": start}
+    if stop is not None:
+        lookups[f"{field}__lt"] = stop
+    return queryset.filter(**lookups)
+
+
+def daily_flow(incomes, expenses):
+    """Return sorted days with the income and expense totals for each, as floats."""
+    # Each side is summed per day by the DB, then merged into one row per day
+    flow = defaultdict(lambda: [0.0, 0.0])
+    for day, total in (
+        incomes.values_list("date_received")
+        .annotate(s=Sum("amount"))
+        .values_list("date_received", "s")
+    ):
+        flow[day][0] = float(total)
+    for day, total in (
+        expenses.values_list("date_spent")
+        .annotate(s=Sum("amount"))
+        .values_list("date_spent", "s")
+    ):
+        flow[day][1] = float(total)
+    days = sorted(flow)
+    return days, [flow[d][0] for d in days], [flow[d][1] for d in days]
+
+
+def search_filter(queryset, field, query):
+    """Restrict queryset to rows whose text field contains query, ignoring case."""
+    # On SQLite each searched column has a trigram FTS5 table (<table>_fts,
+    # kept in sync by triggers); trigrams need at least three characters
+    table = queryset.model._meta.db_table
+    if len(query) < 3 or connections[queryset.db].vendor != "sqlite":
+        return queryset.filter(**{f"{field}__icontains": query})
+    phrase = '"{}"'.format(query.replace('"', '""'))
+    matches = RawSQL(
+        f"SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH %s", (phrase,)
+    )
+    return queryset.filter(pk__in=matches)
+
+
+@lru_cache(maxsize=1)
+def plotly_js_url():
+    """CDN URL of the plotly.js build matching the installed plotly package."""
+    from plotly.offline import get_plotlyjs_version
+
+    return f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+
+
+def cached_chart(key, data, build):
+    """Return build()'s chart, cached under key plus a digest of data (bytes)."""
+    # Charts are pure functions of the aggregates they plot, so the cache key
+    # carries a digest of that data and never needs explicit invalidation
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    cache_key = f"chart:{key}:{digest}"
+    chart = cache.get(cache_key)
+    if chart is None:
+        chart = build()
+        if chart is not None:
+            cache.set(cache_key, chart, CHART_CACHE_TIMEOUT)
+    return chart
+
+
+def list_count_cache_key(user_id):
+    return f"list_counts:{user_id}"
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator that reuses the user's cached row count for the same filters."""
+
+    def __init__(self, object_list, per_page, user_id, filters, **kwargs):
+        """Cache the count under user_id's entry, keyed by the filters tuple."""
+        super().__init__(object_list, per_page, **kwargs)
+        self.user_id = user_id
+        self.filters = filters
+
+    @cached_property
+    def count(self):
+        # All of a user's list counts live in one entry, so a single delete in
+        # clear_finance_cache() drops them whenever their rows change
+        key = list_count_cache_key(self.user_id)
+        counts = cache.get(key) or {}
+        if self.filters not in counts:
+            counts[self.filters] = self.object_list.count()
+            cache.set(key, counts, LIST_COUNT_CACHE_TIMEOUT)
+        return counts[self.filters]
@@ -1,35 +1,56 @@
 import base64
 import csv
+import threading
+from collections import Counter
 from datetime import timedelta
 from decimal import Decimal
-from io import BytesIO
-from itertools import chain
-
-import numpy as np
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.offline as opy
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.db.models import Count, Sum
-from django.http import HttpResponse
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum, Value
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import get_template
 from django.utils import timezone
-from plotly.offline import plot
-from xhtml2pdf import pisa
 
 from apps.expenses.models import Expense
 from apps.income.models import Income
 
 from .models import Category
+from .utils import (
+    cached_chart,
+    daily_flow,
+    filter_period,
+    period_range,
+    search_filter,
+)
+
+_kaleido_lock = threading.Lock()
+_kaleido_server_started = False
+
+
+class _Echo:
+    # File-like sink for csv.writer: hands each row back instead of buffering
+    def write(self, value):
+        return value
 
 
 def _get_plot_image(fig):
+    global _kaleido_server_started
+    import kaleido
+
     try:
-        img_bytes = fig.to_image(format="png", engine="kaleido", width=800, height=400)
+        with _kaleido_lock:
+            img_bytes = fig.to_image(format="png", width=800, height=400)
+            # Chrome works, so keep one Kaleido browser alive for later exports;
+            # failing to start it must not cost the image just rendered
+            if not _kaleido_server_started:
+                try:
+                    kaleido.start_sync_server(silence_warnings=True)
+                    _kaleido_server_started = True
+                except Exception as e:
+                    print(f"Kaleido Server Error: {e}")
         encoding = base64.b64encode(img_bytes).decode("utf-8")
         return f"data:image/png;base64,{encoding}"
     except Exception as e:
@@ -37,7 +58,54 @@ def _get_plot_image(fig):
         return None
 
 
+def _project_balance(daily, horizon):
+    # Running balance and a least-squares line through it, extended by horizon
+    # days; the fit uses dot products over centred x instead of polyfit
+    import numpy as np
+
+    cumulative = np.cumsum(daily)
+    n = cumulative.size
+    xm = (n - 1) / 2.0
+    ym = cumulative.mean()
+    xc = np.arange(n) - xm
+    slope = xc @ (cumulative - ym) / (xc @ xc)
+    intercept = ym - slope * xm
+    projection = slope * np.arange(n, n + horizon) + intercept
+    return cumulative, projection
+
+
+def _transaction_rows(incomes, expenses, with_account=True):
+    # Both sides expose the same columns so the DB can UNION ALL and sort them
+    extra = {"account_name": F("account__name")} if with_account else {}
+    income_rows = incomes.values(
+        "pk",
+        "amount",
+        kind=Value("income"),
+        label=F("source"),
+        transaction_date=F("date_received"),
+        category_name=F("category__name"),
+        **extra,
+    )
+    expense_rows = expenses.values(
+        "pk",
+        "amount",
+        kind=Value("expense"),
+        label=F("title"),
+        transaction_date=F("date_spent"),
+        category_name=F("category__name"),
+        **extra,
+    )
+    # Many rows share a date, so kind and pk make the order (and the pages) stable
+    return income_rows.union(expense_rows, all=True).order_by(
+        "-transaction_date", "kind", "-pk"
+    )
+
+
 def _get_dashboard_data(user, start_date, end_date):
+    import numpy as np
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+
     # 1. Base Querysets
     income_base = Income.objects.filter(
         user=user, is_active=True, date_received__range=[start_date, end_date]
@@ -49,35 +117,48 @@ def _get_dashboard_data(user, start_date, end_date):
 
     # 2. Key Metrics
     total_income = income_base.aggregate(Sum("amount"))["amount__sum"] or Decimal(0)
-    total_expense = expense_base.aggregate(Sum("amount"))["amount__sum"] or Decimal(0)
-
-    total_recurring = expense_base.filter(
-        is_recurring=True, recurring_interval="monthly"
-    ).aggregate(Sum("amount"))["amount__sum"] or Decimal(0)
+    expense_totals = expense_base.aggregate(
+        total=Sum("amount"),
+        recurring=Sum(
+            "amount", filter=Q(is_recurring=True, recurring_interval="monthly")
+        ),
+    )
+    total_expense = expense_totals["total"] or Decimal(0)
+    total_recurring = expense_totals["recurring"] or Decimal(0)
 
     # 3. Budget & Summary Logic
     budget_data = []
     current_month = timezone.now().month
     current_year = timezone.now().year
 
-    categories = Category.objects.filter(user=user, category_type="expense")
-    for cat in categories:
-        spent_this_month = Expense.objects.filter(
+    # One grouped query for this month's spend per category
+    spent_map = dict(
+        Expense.objects.filter(
             user=user,
-            category=cat,
             is_active=True,
             date_spent__month=current_month,
             date_spent__year=current_year,
-        ).aggregate(Sum("amount"))["amount__sum"] or Decimal(0)
+            category__category_type="expense",
+        )
+        .values("category_id")
+        .annotate(spent=Sum("amount"))
+        .values_list("category_id", "spent")
+    )
+
+    categories = Category.objects.filter(user=user, category_type="expense").values(
+        "id", "name", "budget_limit"
+    )
+    for cat in categories:
+        spent_this_month = spent_map.get(cat["id"], Decimal(0))
 
-        limit = cat.budget_limit or Decimal(0)
+        limit = cat["budget_limit"] or Decimal(0)
         # Convert to float for percentage calculation
         percent = (float(spent_this_month) / float(limit) * 100) if limit > 0 else 0
         remaining = limit - spent_this_month
 
         budget_data.append(
             {
-                "name": cat.name,
+                "name": cat["name"],
                 "spent": spent_this_month,
                 "limit": limit,
                 "remaining": remaining,
@@ -86,83 +167,87 @@ def _get_dashboard_data(user, start_date, end_date):
             }
         )
 
-    # 4. Chart 1: Cash Flow (Line Chart) - FIXED TYPE ISSUE
+    # 4. Chart 1: Cash Flow (Line Chart)
     chart_html = "<p class='text-center text-muted py-5'>No trend data available</p>"
 
-    # Prep Income Data
-    df_inc_raw = pd.DataFrame(
-        list(income_base.values("date_received").annotate(total=Sum("amount")))
-    )
-    if not df_inc_raw.empty:
-        df_inc = df_inc_raw.rename(columns={"date_received": "Date", "total": "Income"})
-    else:
-        df_inc = pd.DataFrame(columns=["Date", "Income"])
+    # Same per-day merge as the PDF export, see daily_flow()
+    days, inc, exp = daily_flow(income_base, expense_base)
+
+    if days:
+        # ORM dates are already typed, so no to_datetime parsing is needed
+        dates = np.array(days, dtype="datetime64[D]")
+
+        def build_line():
+            fig = go.Figure(
+                [
+                    go.Scatter(
+                        x=dates,
+                        y=inc,
+                        name="Income",
+                        mode="lines",
+                        line=dict(color="#198754"),
+                    ),
+                    go.Scatter(
+                        x=dates,
+                        y=exp,
+                        name="Expense",
+                        mode="lines",
+                        line=dict(color="#dc3545"),
+                    ),
+                ]
+            )
+            fig.update_layout(
+                template="plotly_white",
+                margin=dict(l=5, r=5, t=10, b=5),
+                height=300,
+                legend=dict(
+                    orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1
+                ),
+            )
+            return fig.to_html(
+                full_html=False, include_plotlyjs=False, div_id="cash-flow"
+            )
 
-    # Prep Expense Data
-    df_exp_raw = pd.DataFrame(
-        list(expense_base.values("date_spent").annotate(total=Sum("amount")))
-    )
-    if not df_exp_raw.empty:
-        df_exp = df_exp_raw.rename(columns={"date_spent": "Date", "total": "Expense"})
-    else:
-        df_exp = pd.DataFrame(columns=["Date", "Expense"])
-
-    if not df_inc.empty or not df_exp.empty:
-        # Merge and fill missing values
-        df_merged = pd.merge(df_inc, df_exp, on="Date", how="outer").fillna(0)
-
-        # --- FIX: Ensure types are identical for Plotly Wide-Form ---
-        df_merged["Date"] = pd.to_datetime(df_merged["Date"])
-        df_merged["Income"] = df_merged["Income"].astype(float)
-        df_merged["Expense"] = df_merged["Expense"].astype(float)
-        df_merged = df_merged.sort_values("Date")
-
-        fig = px.line(
-            df_merged,
-            x="Date",
-            y=["Income", "Expense"],
-            template="plotly_white",
-            color_discrete_map={"Income": "#198754", "Expense": "#dc3545"},
+        chart_html = cached_chart(
+            f"dash_line:{user.id}:{start_date}:{end_date}",
+            repr((days, inc, exp)).encode(),
+            build_line,
         )
-        fig.update_layout(
-            margin=dict(l=5, r=5, t=10, b=5),
-            height=300,
-            legend=dict(
-                orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1
-            ),
-            xaxis_title=None,
-            yaxis_title=None,
-        )
-        chart_html = plot(fig, auto_open=False, output_type="div")
 
     # 5. Chart 2: Expense Distribution (Pie Chart)
-    cat_qs = expense_base.values("category__name").annotate(total=Sum("amount"))
+    cat_rows = list(
+        expense_base.values_list("category__name")
+        .annotate(total=Sum("amount"))
+        .values_list("category__name", "total")
+    )
     pie_chart_html = "<p class='text-center text-muted py-5'>No expense categories</p>"
 
-    if cat_qs.exists():
-        df_cat = pd.DataFrame(list(cat_qs))
-        df_cat["total"] = df_cat["total"].astype(float)  # Fix Decimal issue
+    if cat_rows:
+        labels, totals = zip(*cat_rows, strict=True)
+        values = [float(t) for t in totals]
+
+        def build_pie():
+            pie_fig = go.Figure(
+                go.Pie(
+                    labels=labels,
+                    values=values,
+                    hole=0.4,
+                    marker=dict(colors=qualitative.Safe),
+                )
+            )
+            pie_fig.update_layout(margin=dict(l=5, r=5, t=10, b=5), height=300)
+            return pie_fig.to_html(
+                full_html=False, include_plotlyjs=False, div_id="expense-distribution"
+            )
 
-        pie_fig = px.pie(
-            df_cat,
-            values="total",
-            names="category__name",
-            hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Safe,
+        pie_chart_html = cached_chart(
+            f"dash_pie:{user.id}:{start_date}:{end_date}",
+            repr((labels, values)).encode(),
+            build_pie,
         )
-        pie_fig.update_layout(margin=dict(l=5, r=5, t=10, b=5), height=300)
-        pie_chart_html = plot(pie_fig, auto_open=False, output_type="div")
 
     # 6. Recent Transactions List
-    # Combine and sort by date (using actual model date fields)
-    recent_inc = list(income_base.order_by("-date_received")[:5])
-    recent_exp = list(expense_base.order_by("-date_spent")[:5])
-
-    recent_transactions = sorted(
-        chain(recent_inc, recent_exp),
-        key=lambda x: getattr(x, "date_received", getattr(x, "date_spent", None)),
-        reverse=True,
-    )[:8]
+    recent_transactions = list(_transaction_rows(income_base, expense_base)[:8])
 
     return {
         "total_income": total_income,
@@ -219,118 +304,118 @@ def export_report_csv(request):
     start_str = request.GET.get("start")
     end_str = request.GET.get("end")
 
-    income_qs = Income.objects.filter(user=request.user, is_active=True).select_related(
-        "category"
+    # Only the columns written to the CSV
+    income_qs = (
+        Income.objects.filter(user=request.user, is_active=True)
+        .select_related("category", "account")
+        .only(
+            "source",
+            "amount",
+            "currency",
+            "date_received",
+            "notes",
+            "category__name",
+            "account__name",
+        )
+    )
+    expense_qs = (
+        Expense.objects.filter(user=request.user, is_active=True)
+        .select_related("category", "account")
+        .only(
+            "title",
+            "amount",
+            "date_spent",
+            "notes",
+            "category__name",
+            "account__name",
+            "account__currency",
+        )
     )
-    expense_qs = Expense.objects.filter(
-        user=request.user, is_active=True
-    ).select_related("category")
 
     if start_str and end_str:
         income_qs = income_qs.filter(date_received__range=[start_str, end_str])
         expense_qs = expense_qs.filter(date_spent__range=[start_str, end_str])
 
-    response = HttpResponse(content_type="text/csv")
-    filename = f"Financial_Report_{timezone.now().date()}.csv"
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-
-    writer = csv.writer(response)
-    writer.writerow(
-        [
-            "Type",
-            "Title/Source",
-            "Category",
-            "Amount",
-            "Currency",
-            "Date",
-            "Payment Method",
-            "Notes",
-        ]
-    )
+    writer = csv.writer(_Echo())
 
-    # FIX: Use .category.name instead of just .category
-    for inc in income_qs:
-        writer.writerow(
+    def rows():
+        yield writer.writerow(
             [
-                "Income",
-                inc.source,
-                inc.category.name if inc.category else "Uncategorized",
-                inc.amount,
-                inc.currency,
-                inc.date_received,
-                inc.payment_method,
-                inc.notes,
+                "Type",
+                "Title/Source",
+                "Category",
+                "Amount",
+                "Currency",
+                "Date",
+                "Account",
+                "Notes",
             ]
         )
 
-    for exp in expense_qs:
-        writer.writerow(
-            [
-                "Expense",
-                exp.title,
-                exp.category.name if exp.category else "Uncategorized",
-                exp.amount,
-                exp.currency,
-                exp.date_spent,
-                exp.payment_method,
-                exp.notes,
-            ]
-        )
+        for inc in income_qs.iterator(chunk_size=2000):
+            yield writer.writerow(
+                [
+                    "Income",
+                    inc.source,
+                    inc.category.name if inc.category else "Uncategorized",
+                    inc.amount,
+                    inc.currency,
+                    inc.date_received,
+                    inc.account.name,
+                    inc.notes,
+                ]
+            )
 
+        for exp in expense_qs.iterator(chunk_size=2000):
+            yield writer.writerow(
+                [
+                    "Expense",
+                    exp.title,
+                    exp.category.name if exp.category else "Uncategorized",
+                    exp.amount,
+                    exp.account.currency,
+                    exp.date_spent,
+                    exp.account.name,
+                    exp.notes,
+                ]
+            )
+
+    # Stream rows as they are written instead of building the file in memory
+    response = StreamingHttpResponse(rows(), content_type="text/csv")
+    filename = f"Financial_Report_{timezone.now().date()}.csv"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
     return response
 
 
 @login_required
 def export_report_pdf(request):
+    import plotly.graph_objects as go
+    from xhtml2pdf import pisa
+
     # 1. Capture Filters
     period = request.GET.get("period", "this_month")
     report_type = request.GET.get("type")  # 'income', 'expense', or None
     query = request.GET.get("q")
     category_id = request.GET.get("category", None)
 
-    print("---------")
-    print(category_id)
-    print("---------")
-
     # 2. Base Querysets
     income_qs = Income.objects.filter(user=request.user, is_active=True)
     expense_qs = Expense.objects.filter(user=request.user, is_active=True)
 
     # FIX: Check if category_id is specifically the string "None" or empty
-    if category_id and category_id != "None" and category_id != "":
+    if category_id and category_id not in ("None", ""):
         expense_qs = expense_qs.filter(category_id=category_id)
         income_qs = income_qs.filter(category_id=category_id)
 
     # 3. Apply Date Filtering (Matches expense_list logic)
     today = timezone.now().date()
-    start_date = None
-
-    if period == "last_week":
-        start_date = today - timedelta(days=7)
-    elif period == "this_month":
-        start_date = today.replace(day=1)
-    elif period == "last_month":
-        first_this = today.replace(day=1)
-        end_date = first_this - timedelta(days=1)
-        start_date = end_date.replace(day=1)
-        # Specific override for last month
-        income_qs = income_qs.filter(date_received__range=[start_date, end_date])
-        expense_qs = expense_qs.filter(date_spent__range=[start_date, end_date])
-    elif period == "last_year":
-        last_year = today.year - 1
-        income_qs = income_qs.filter(date_received__year=last_year)
-        expense_qs = expense_qs.filter(date_spent__year=last_year)
-
-    if start_date and period not in ["last_month", "last_year", "all"]:
-        income_qs = income_qs.filter(date_received__gte=start_date)
-        expense_qs = expense_qs.filter(date_spent__gte=start_date)
-
-    # 4. Apply Search/Category & Type Filters
+    start_date, end_date = period_range(period, today)
+    income_qs = filter_period(income_qs, "date_received", start_date, end_date)
+    expense_qs = filter_period(expense_qs, "date_spent", start_date, end_date)
+
+    # 4. Apply Search & Type Filters
     if query:
-        expense_qs = expense_qs.filter(title__icontains=query)
-    if category_id:
-        expense_qs = expense_qs.filter(category_id=category_id)
-        income_qs = income_qs.filter(category_id=category_id)
+        expense_qs = search_filter(expense_qs, "title", query)
 
     if report_type == "income":
         expense_qs = expense_qs.none()
@@ -346,56 +431,73 @@ def export_report_pdf(request):
     line_chart = None
     pie_chart = None
 
-    df_inc = pd.DataFrame(list(income_qs.values("date_received", "amount"))).rename(
-        columns={"date_received": "Date"}
-    )
-    df_exp = pd.DataFrame(list(expense_qs.values("date_spent", "amount"))).rename(
-        columns={"date_spent": "Date"}
-    )
+    days, inc, exp = daily_flow(income_qs, expense_qs)
 
-    if not df_inc.empty or not df_exp.empty:
-        df_inc = (
-            df_inc.groupby("Date")["amount"].sum().reset_index(name="Income")
-            if not df_inc.empty
-            else pd.DataFrame(columns=["Date", "Income"])
-        )
-        df_exp = (
-            df_exp.groupby("Date")["amount"].sum().reset_index(name="Expense")
-            if not df_exp.empty
-            else pd.DataFrame(columns=["Date", "Expense"])
-        )
-        df_merged = (
-            pd.merge(df_inc, df_exp, on="Date", how="outer")
-            .fillna(0)
-            .sort_values("Date")
-        )
-
-        cols = [
-            c
-            for c in ["Income", "Expense"]
-            if c in df_merged.columns and df_merged[c].any()
-        ]
+    if days:
+        series = {"Income": inc, "Expense": exp}
+        cols = [c for c in series if any(series[c])]
         if cols:
-            fig_line = px.line(
-                df_merged,
-                x="Date",
-                y=cols,
-                template="plotly_white",
-                color_discrete_map={"Income": "#198754", "Expense": "#dc3545"},
+
+            def build_line():
+                colors = {"Income": "#198754", "Expense": "#dc3545"}
+                fig_line = go.Figure(
+                    [
+                        go.Scatter(
+                            x=days,
+                            y=series[c],
+                            name=c,
+                            mode="lines",
+                            line=dict(color=colors[c]),
+                        )
+                        for c in cols
+                    ]
+                )
+                fig_line.update_layout(
+                    template="plotly_white",
+                    xaxis_title="Date",
+                    yaxis_title="value",
+                    legend_title_text="variable",
+                )
+                return _get_plot_image(fig_line)
+
+            line_chart = cached_chart(
+                f"pdf_line:{request.user.id}:{period}:{','.join(cols)}",
+                repr((days, inc, exp)).encode(),
+                build_line,
             )
-            line_chart = _get_plot_image(fig_line)
 
     if report_type != "income" and expense_qs.exists():
-        cat_df = pd.DataFrame(
-            list(expense_qs.values("category__name").annotate(total=Sum("amount")))
+        by_category = list(
+            expense_qs.values_list("category__name")
+            .annotate(total=Sum("amount"))
+            .values_list("category__name", "total")
+            .order_by()
+        )
+
+        def build_pie():
+            fig_pie = go.Figure(
+                go.Pie(
+                    labels=[name for name, _ in by_category],
+                    values=[float(total) for _, total in by_category],
+                    hole=0.3,
+                )
+            )
+            return _get_plot_image(fig_pie)
+
+        pie_chart = cached_chart(
+            f"pdf_pie:{request.user.id}:{period}",
+            repr(by_category).encode(),
+            build_pie,
         )
-        fig_pie = px.pie(cat_df, values="total", names="category__name", hole=0.3)
-        pie_chart = _get_plot_image(fig_pie)
 
     # 7. Render PDF Response
     context = {
-        "income": income_qs.order_by("-date_received"),
-        "expenses": expense_qs.order_by("-date_spent"),
+        "income": income_qs.select_related("category")
+        .only("date_received", "source", "amount", "category__name")
+        .order_by("-date_received"),
+        "expenses": expense_qs.select_related("category")
+        .only("date_spent", "title", "amount", "category__name")
+        .order_by("-date_spent"),
         "total_income": total_income,
         "total_expense": total_expense,
         "balance": balance,
@@ -409,17 +511,20 @@ def export_report_pdf(request):
 
     template = get_template("dashboard/report_pdf.html")
     html = template.render(context)
-    result = BytesIO()
-    pisa.pisaDocument(BytesIO(html.encode("UTF-8")), result)
 
-    response = HttpResponse(result.getvalue(), content_type="application/pdf")
+    # HttpResponse is file-like, so the PDF is written straight into it
+    response = HttpResponse(content_type="application/pdf")
     filename = f"Kharcha_{report_type or 'Report'}_{today}.pdf"
     response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    pisa.CreatePDF(src=html, dest=response, encoding="UTF-8")
     return response
 
 
 @login_required
 def all_transactions_view(request):
+    import numpy as np
+    import plotly.graph_objects as go
+
     # 1. Setup Base Querysets
     incomes = Income.objects.filter(user=request.user, is_active=True)
     expenses = Expense.objects.filter(user=request.user, is_active=True)
@@ -427,98 +532,85 @@ def all_transactions_view(request):
     # 2. Date Filtering Logic
     period = request.GET.get("period", "this_month")
     today = timezone.now().date()
-    start_date = None
-
-    if period == "last_week":
-        start_date = today - timedelta(days=7)
-    elif period == "this_month":
-        start_date = today.replace(day=1)
-    elif period == "last_month":
-        first_this = today.replace(day=1)
-        start_date = (first_this - timedelta(days=1)).replace(day=1)
-        end_month = first_this - timedelta(days=1)
-        incomes = incomes.filter(date_received__range=[start_date, end_month])
-        expenses = expenses.filter(date_spent__range=[start_date, end_month])
-    elif period == "last_year":
-        start_date = today.replace(year=today.year - 1, month=1, day=1)
-        end_year = today.replace(year=today.year - 1, month=12, day=31)
-        incomes = incomes.filter(date_received__range=[start_date, end_year])
-        expenses = expenses.filter(date_spent__range=[start_date, end_year])
-
-    # Apply start_date filter for ongoing periods (week/this month)
-    if start_date and period not in ["last_month", "last_year", "all"]:
-        incomes = incomes.filter(date_received__gte=start_date)
-        expenses = expenses.filter(date_spent__gte=start_date)
-
-    # 3. Merge and Sort for Table
-    all_list = sorted(
-        chain(incomes, expenses),
-        key=lambda x: x.date_received if hasattr(x, "date_received") else x.date_spent,
-        reverse=True,
-    )
+    start_date, end_date = period_range(period, today)
+    incomes = filter_period(incomes, "date_received", start_date, end_date)
+    expenses = filter_period(expenses, "date_spent", start_date, end_date)
+
+    # 3. Merge and Sort for Table (in the DB, so pagination is LIMIT/OFFSET)
+    # The table has no account column, so skip that join
+    all_rows = _transaction_rows(incomes, expenses, with_account=False)
 
     # 4. Projection Logic (Last 30 Days Trend)
     # We always use 30 days of history for a stable projection, regardless of filter
     hist_start = today - timedelta(days=30)
-    date_range = pd.date_range(start=hist_start, end=today)
-    df_balance = pd.DataFrame({"Date": date_range, "Amount": 0.0})
+    tomorrow = today + timedelta(days=1)
+    hist_dates = np.arange(hist_start, tomorrow, dtype="datetime64[D]")
 
-    # Get data specifically for the chart
-    chart_inc = Income.objects.filter(
-        user=request.user, date_received__range=[hist_start, today]
+    # Get data specifically for the chart, already summed per day in the DB
+    inc_daily = (
+        Income.objects.filter(
+            user=request.user, date_received__range=[hist_start, today]
+        )
+        .values_list("date_received")
+        .annotate(s=Sum("amount"))
+        .values_list("date_received", "s")
     )
-    chart_exp = Expense.objects.filter(
-        user=request.user, date_spent__range=[hist_start, today]
+    exp_daily = (
+        Expense.objects.filter(user=request.user, date_spent__range=[hist_start, today])
+        .values_list("date_spent")
+        .annotate(s=Sum("amount"))
+        .values_list("date_spent", "s")
     )
 
-    for inc in chart_inc:
-        df_balance.loc[
-            df_balance["Date"] == pd.Timestamp(inc.date_received), "Amount"
-        ] += float(inc.amount)
-    for exp in chart_exp:
-        df_balance.loc[
-            df_balance["Date"] == pd.Timestamp(exp.date_spent), "Amount"
-        ] -= float(exp.amount)
-
-    df_balance["Cumulative"] = df_balance["Amount"].cumsum()
+    daily = np.zeros(hist_dates.size)
+    for d, total in inc_daily:
+        daily[(d - hist_start).days] += float(total)
+    for d, total in exp_daily:
+        daily[(d - hist_start).days] -= float(total)
 
     # Regression
-    y = df_balance["Cumulative"].values
-    x = np.arange(len(y))
-    slope, intercept = np.polyfit(x, y, 1)
-
-    future_x = np.arange(len(y), len(y) + 30)
-    future_dates = pd.date_range(start=today + timedelta(days=1), periods=30)
-    projection = slope * future_x + intercept
+    cumulative, projection = _project_balance(daily, 30)
+    future_dates = np.arange(
+        tomorrow, tomorrow + timedelta(days=30), dtype="datetime64[D]"
+    )
 
     # 5. Create Chart
-    fig = go.Figure()
-    fig.add_trace(
-        go.Scatter(
-            x=df_balance["Date"],
-            y=df_balance["Cumulative"],
-            name="History",
-            line=dict(color="#0d6efd", width=3),
+    def build_projection():
+        fig = go.Figure()
+        fig.add_trace(
+            go.Scatter(
+                x=hist_dates,
+                y=cumulative,
+                name="History",
+                line=dict(color="#0d6efd", width=3),
+            )
         )
-    )
-    fig.add_trace(
-        go.Scatter(
-            x=future_dates,
-            y=projection,
-            name="Projected",
-            line=dict(color="#6c757d", dash="dot"),
+        fig.add_trace(
+            go.Scatter(
+                x=future_dates,
+                y=projection,
+                name="Projected",
+                line=dict(color="#6c757d", dash="dot"),
+            )
         )
+        fig.update_layout(
+            template="plotly_white",
+            height=350,
+            margin=dict(l=0, r=0, t=30, b=0),
+            legend=dict(
+                orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1
+            ),
+        )
+        return fig.to_html(
+            full_html=False, include_plotlyjs=False, div_id="balance-projection"
+        )
+
+    projection_html = cached_chart(
+        f"projection:{request.user.id}:{today}", daily.tobytes(), build_projection
     )
-    fig.update_layout(
-        template="plotly_white",
-        height=350,
-        margin=dict(l=0, r=0, t=30, b=0),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-    )
-    projection_html = opy.plot(fig, auto_open=False, output_type="div")
 
     # 6. Pagination
-    paginator = Paginator(all_list, 20)
+    paginator = Paginator(all_rows, 20)
     page_obj = paginator.get_page(request.GET.get("page"))
 
     return render(
@@ -534,6 +626,8 @@ def all_transactions_view(request):
 
 @login_required
 def category_list(request):
+    import plotly.graph_objects as go
+
     # 1. Base Queryset
     categories_qs = (
         Category.objects.filter(user=request.user)
@@ -550,22 +644,32 @@ def category_list(request):
     if cat_type:
         categories_qs = categories_qs.filter(category_type=cat_type)
 
+    categories = list(categories_qs)
+
     # 3. Chart Generation (Distribution of Category Types)
     pie_chart_div = None
-    if categories_qs.exists():
-        df = pd.DataFrame(list(categories_qs.values("name", "category_type")))
-        fig = px.pie(
-            df,
-            names="category_type",
+    if categories:
+        type_counts = Counter(cat.category_type for cat in categories)
+        colors = {"income": "#198754", "expense": "#dc3545"}
+        fig = go.Figure(
+            go.Pie(
+                labels=list(type_counts),
+                values=list(type_counts.values()),
+                hole=0.4,
+                marker=dict(colors=[colors.get(t) for t in type_counts]),
+            )
+        )
+        fig.update_layout(
             title="Category Type Distribution",
-            hole=0.4,
-            color_discrete_map={"income": "#198754", "expense": "#dc3545"},
+            margin=dict(t=40, b=0, l=0, r=0),
+            height=300,
+        )
+        pie_chart_div = fig.to_html(
+            full_html=False, include_plotlyjs=False, div_id="category-types"
         )
-        fig.update_layout(margin=dict(t=40, b=0, l=0, r=0), height=300)
-        pie_chart_div = plot(fig, output_type="div")
 
     context = {
-        "categories": categories_qs,
+        "categories": categories,
         "chart_pie": pie_chart_div,
         "search_query": query or "",
         "current_type": cat_type or "",
@@ -586,7 +690,7 @@ def manage_category(request):
             category = get_object_or_404(Category, id=category_id, user=request.user)
             category.name = name
             category.category_type = category_type
-            category.save()
+            category.save(update_fields=["name", "category_type"])
             messages.success(request, f"Category '{name}' updated successfully.")
         else:
             # --- Create Logic ---
@@ -600,12 +704,17 @@ def manage_category(request):
 
 @login_required
 def delete_category(request, pk):
-    category = get_object_or_404(Category, id=pk, user=request.user)
-
-    has_expenses = category.expense_set.exists()
-    has_income = category.income_set.exists()
+    # Usage checks ride along as EXISTS subqueries in the same lookup
+    category = get_object_or_404(
+        Category.objects.annotate(
+            has_expenses=Exists(Expense.objects.filter(category=OuterRef("pk"))),
+            has_income=Exists(Income.objects.filter(category=OuterRef("pk"))),
+        ),
+        id=pk,
+        user=request.user,
+    )
 
-    if has_expenses or has_income:
+    if category.has_expenses or category.has_income:
         messages.error(
             request,
             "Cannot delete category: It is currently linked to existing records.",
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 10:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_userfinancesummary'),
+        ('dashboard', '0001_initial'),
+        ('expenses', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['user', 'is_active', 'date_spent'], name='expenses_ex_user_id_b731ce_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 10:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_userfinancesummary'),
+        ('dashboard', '0001_initial'),
+        ('expenses', '0002_expense_expenses_ex_user_id_b731ce_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='expense',
+            name='expenses_ex_user_id_b731ce_idx',
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-date_spent'], name='expense_active_user_date'),
+        ),
+    ]
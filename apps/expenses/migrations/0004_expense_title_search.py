@@ -0,0 +1,45 @@
+from django.db import migrations
+
+TABLE = "expenses_expense"
+COLUMN = "title"
+
+
+def create_search_index(apps, schema_editor):
+    # Trigram FTS5 index behind dashboard.utils.search_filter; SQLite only
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    fts = f"{TABLE}_fts"
+    for sql in (
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({COLUMN}, content='{TABLE}', "
+        f"content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {TABLE} BEGIN "
+        f"INSERT INTO {fts}(rowid, {COLUMN}) VALUES (new.id, new.{COLUMN}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {TABLE} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {COLUMN}) "
+        f"VALUES ('delete', old.id, old.{COLUMN}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {COLUMN} ON {TABLE} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {COLUMN}) "
+        f"VALUES ('delete', old.id, old.{COLUMN}); "
+        f"INSERT INTO {fts}(rowid, {COLUMN}) VALUES (new.id, new.{COLUMN}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ):
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    fts = f"{TABLE}_fts"
+    for suffix in ("ai", "ad", "au"):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("expenses", "0003_remove_expense_expenses_ex_user_id_b731ce_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,11 +1,34 @@
+from collections import defaultdict
+from decimal import Decimal
+
 from django.db import models
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db.models import F
 
 from apps.dashboard.models import Category
-from apps.accounts.models import Account
+from apps.accounts.models import Account, as_decimal, clear_finance_cache
 from django.db import transaction
 
 
+def _debit_accounts(totals):
+    # One guarded UPDATE per (user, account); ownership and the funds check are
+    # both part of the statement, so no prior SELECT of the account is needed
+    for (user_id, account_id), total in totals.items():
+        updated = Account.objects.filter(
+            pk=account_id, user_id=user_id, balance__gte=total
+        ).update(balance=F("balance") - total)
+        if not updated:
+            name = (
+                Account.objects.filter(pk=account_id, user_id=user_id)
+                .values_list("name", flat=True)
+                .first()
+            )
+            if name is None:
+                raise ValidationError("Select a valid account.")
+            raise ValidationError(f"Insufficient funds in {name}.")
+
+
 class Expense(models.Model):
     RECURRING_INTERVALS = [
         ("none", "None"),
@@ -39,12 +62,41 @@ class Expense(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Partial index: the ORM emits a bare "is_active" test, which SQLite
+        # only matches against an index condition, not an index column
+        indexes = [
+            models.Index(
+                fields=["user", "-date_spent"],
+                condition=models.Q(is_active=True),
+                name="expense_active_user_date",
+            )
+        ]
+
     def save(self, *args, **kwargs):
         with transaction.atomic():
             if not self.pk:
-                self.account.withdraw(self.amount)
+                _debit_accounts(
+                    {(self.user_id, self.account_id): as_decimal(self.amount)}
+                )
+                clear_finance_cache(self.user_id)
             super().save(*args, **kwargs)
 
+    @classmethod
+    def bulk_create_with_withdraw(cls, expenses, batch_size=None):
+        """Insert expenses in bulk, debiting each account once for its total."""
+        totals = defaultdict(Decimal)
+        for expense in expenses:
+            totals[expense.user_id, expense.account_id] += as_decimal(expense.amount)
+
+        with transaction.atomic():
+            _debit_accounts(totals)
+            created = cls.objects.bulk_create(expenses, batch_size=batch_size)
+
+        for user_id in {expense.user_id for expense in expenses}:
+            clear_finance_cache(user_id)
+        return created
+
     def __str__(self):
         return f"{self.title} - {self.amount}"
 
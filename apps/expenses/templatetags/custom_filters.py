@@ -1,13 +1,25 @@
+from functools import lru_cache
+
 from django import template
 
 register = template.Library()
 
 
+@lru_cache(maxsize=1024)
+def _replace_underscore(value):
+    return value.replace("_", " ").title()
+
+
+@lru_cache(maxsize=1024)
+def _replace_parts(arg):
+    return tuple(arg.split(",", 1)) if "," in arg else None
+
+
 @register.filter(name="replace_underscore")
 def replace_underscore(value):
     """Replaces underscores with spaces and capitalizes words"""
     if isinstance(value, str):
-        return value.replace("_", " ").title()
+        return _replace_underscore(value)
     return value
 
 
@@ -17,8 +29,9 @@ def replace(value, arg):
     with the second half.
     Usage: {{ value|replace:"old,new" }}
     """
-    if "," not in arg:
+    parts = _replace_parts(arg)
+    if parts is None:
         return value
 
-    old, new = arg.split(",")
+    old, new = parts
     return str(value).replace(old, new)
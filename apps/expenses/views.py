@@ -1,105 +1,159 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Sum
+from django.core.cache import cache
+from django.db.models import F, Sum
 from django.db import transaction
 from django.core.exceptions import ValidationError
 from datetime import date
-import plotly.express as px
-from plotly.offline import plot
-import pandas as pd
 
 from .models import Expense, Category
-from apps.accounts.models import Account, Debt
-from decimal import Decimal
+from apps.dashboard.utils import (
+    CachedCountPaginator,
+    cached_chart,
+    search_filter,
+)
+from apps.accounts.context import user_choices
+from apps.accounts.models import (
+    DASHBOARD_CACHE_TIMEOUT,
+    Account,
+    UserFinanceSummary,
+    as_decimal,
+    clear_finance_cache,
+    summary_cache_key,
+)
+from decimal import Decimal, InvalidOperation
 
 
-@login_required
-def expense_list(request):
+def _financial_summary(user):
+    total_balance = (
+        Account.objects.filter(user=user).aggregate(Sum("balance"))["balance__sum"] or 0
+    )
+    # Unsettled debt totals are kept up to date on the summary row, so both
+    # come back from a single lookup instead of two SUM queries
+    debts = UserFinanceSummary.for_user(user)
+    to_receive = debts.unsettled_receivable_total
+    to_pay = debts.unsettled_payable_total
+    return {
+        "total_cash": total_balance,
+        "total_receivable": to_receive,
+        "total_payable": to_pay,
+        "net_worth": (total_balance + to_receive) - to_pay,
+    }
+
+
+def _filtered_expenses(request):
     expenses_qs = (
         Expense.objects.filter(user=request.user, is_active=True)
         .select_related("category", "account")
+        .only("title", "amount", "date_spent", "category__name", "account__name")
         .order_by("-date_spent")
     )
 
-    # --- 1. Filter Logic ---
     query = request.GET.get("q")
     category_id = request.GET.get("category")
     if query:
-        expenses_qs = expenses_qs.filter(title__icontains=query)
+        expenses_qs = search_filter(expenses_qs, "title", query)
     if category_id:
         expenses_qs = expenses_qs.filter(category_id=category_id)
+    return expenses_qs, query, category_id
+
+
+@login_required
+def expense_list(request):
+    # --- 1. Filter Logic ---
+    expenses_qs, query, category_id = _filtered_expenses(request)
 
     # --- 2. Financial Summary ---
-    total_balance = (
-        Account.objects.filter(user=request.user).aggregate(Sum("balance"))[
-            "balance__sum"
-        ]
-        or 0
+    # Cleared once every balance/debt write commits, see clear_finance_cache()
+    summary = cache.get_or_set(
+        summary_cache_key(request.user.id),
+        lambda: _financial_summary(request.user),
+        DASHBOARD_CACHE_TIMEOUT,
     )
-    to_receive = (
-        Debt.objects.filter(
-            user=request.user, debt_type="receivable", is_settled=False
-        ).aggregate(Sum("remaining_amount"))["remaining_amount__sum"]
-        or 0
-    )
-    to_pay = (
-        Debt.objects.filter(
-            user=request.user, debt_type="payable", is_settled=False
-        ).aggregate(Sum("remaining_amount"))["remaining_amount__sum"]
-        or 0
+
+    # --- 3. Pagination ---
+    # Charts are loaded separately by expense_charts once the page is shown
+    paginator = CachedCountPaginator(
+        expenses_qs, 10, request.user.id, ("expenses", query, category_id)
     )
+    page_obj = paginator.get_page(request.GET.get("page"))
+
+    context = {
+        "expenses": page_obj,
+        **summary,
+        "search_query": query or "",
+        "selected_category": category_id,
+    }
+    return render(request, "expenses/expense_list.html", context)
+
+
+@login_required
+def expense_charts(request):
+    import plotly.express as px
+
+    expenses_qs, query, category_id = _filtered_expenses(request)
 
-    # --- 3. Chart Generation ---
     pie_chart_div = None
     bar_chart_div = None
-    if expenses_qs.exists():
-        # Convert queryset to list of dicts for Pandas
-        data = list(expenses_qs.values("amount", "category__name", "date_spent"))
-        df = pd.DataFrame(data)
+    # Both charts are fed per-group sums computed by the DB, and the rendered
+    # divs are cached against those sums
+    by_category = list(
+        expenses_qs.values_list("category__name")
+        .annotate(total=Sum("amount"))
+        .values_list("category__name", "total")
+        .order_by()
+    )
+    if by_category:
+        daily = list(
+            expenses_qs.values_list("date_spent")
+            .annotate(total=Sum("amount"))
+            .values_list("date_spent", "total")
+            .order_by("date_spent")
+        )
 
         # Pie Chart: Spending by Category
-        fig_pie = px.pie(
-            df,
-            values="amount",
-            names="category__name",
-            title="Spending by Category",
-            hole=0.4,
-            color_discrete_sequence=px.colors.sequential.RdBu,
-        )
-        fig_pie.update_layout(margin=dict(t=40, b=0, l=0, r=0), height=350)
-        pie_chart_div = plot(fig_pie, output_type="div")
+        def build_pie():
+            fig_pie = px.pie(
+                names=[name for name, _ in by_category],
+                values=[float(total) for _, total in by_category],
+                labels={"names": "category__name", "values": "amount"},
+                title="Spending by Category",
+                hole=0.4,
+                color_discrete_sequence=px.colors.sequential.RdBu,
+            )
+            fig_pie.update_layout(margin=dict(t=40, b=0, l=0, r=0), height=350)
+            return fig_pie.to_html(
+                full_html=False, include_plotlyjs=False, div_id="expense-pie"
+            )
 
         # Bar Chart: Daily Expense Trend
-        # Group by date and sum the amounts
-        daily_df = df.groupby("date_spent")["amount"].sum().reset_index()
-        daily_df = daily_df.sort_values("date_spent")  # Ensure chronological order
-
-        fig_bar = px.bar(
-            daily_df,
-            x="date_spent",
-            y="amount",
-            title="Daily Expense Trend",
-            labels={"date_spent": "Date", "amount": "NPR"},
+        def build_bar():
+            fig_bar = px.bar(
+                x=[day for day, _ in daily],
+                y=[float(total) for _, total in daily],
+                title="Daily Expense Trend",
+                labels={"x": "Date", "y": "NPR"},
+            )
+            fig_bar.update_traces(marker_color="#dc3545")  # Match the danger/red theme
+            fig_bar.update_layout(margin=dict(t=40, b=0, l=0, r=0), height=350)
+            return fig_bar.to_html(
+                full_html=False, include_plotlyjs=False, div_id="expense-trend"
+            )
+
+        chart_key = f"{request.user.id}:{query}:{category_id}"
+        pie_chart_div = cached_chart(
+            f"exp_pie:{chart_key}", repr(by_category).encode(), build_pie
+        )
+        bar_chart_div = cached_chart(
+            f"exp_bar:{chart_key}", repr(daily).encode(), build_bar
         )
-        fig_bar.update_traces(marker_color="#dc3545")  # Match the danger/red theme
-        fig_bar.update_layout(margin=dict(t=40, b=0, l=0, r=0), height=350)
-        bar_chart_div = plot(fig_bar, output_type="div")
 
-    context = {
-        "expenses": expenses_qs,
-        "total_cash": total_balance,
-        "total_receivable": to_receive,
-        "total_payable": to_pay,
-        "net_worth": (total_balance + to_receive) - to_pay,
-        "categories": Category.objects.filter(
-            user=request.user, category_type="expense"
-        ),
-        "accounts": Account.objects.filter(user=request.user),
-        "pie_chart": pie_chart_div,
-        "bar_chart": bar_chart_div,
-    }
-    return render(request, "expenses/expense_list.html", context)
+    return render(
+        request,
+        "expenses/expense_charts.html",
+        {"pie_chart": pie_chart_div, "bar_chart": bar_chart_div},
+    )
 
 
 @login_required
@@ -108,16 +162,15 @@ def add_expense(request):
         try:
             with transaction.atomic():
                 amount = Decimal(request.POST.get("amount", 0))
-                account = get_object_or_404(
-                    Account, id=request.POST.get("account"), user=request.user
-                )
                 category = get_object_or_404(
                     Category, id=request.POST.get("category"), user=request.user
                 )
 
+                # Expense.save debits the account with one UPDATE scoped to
+                # this user, so the account needs no separate lookup
                 Expense.objects.create(
                     user=request.user,
-                    account=account,
+                    account_id=request.POST.get("account"),
                     category=category,
                     title=request.POST.get("title"),
                     amount=amount,
@@ -137,14 +190,14 @@ def add_expense(request):
         except Exception as e:
             messages.error(request, f"An error occurred: {str(e)}")
 
+    categories = user_choices(request, "expense_categories")
+    accounts = user_choices(request, "accounts")
     return render(
         request,
         "expenses/expense_form.html",
         {
-            "categories": Category.objects.filter(
-                user=request.user, category_type="expense"
-            ),
-            "accounts": Account.objects.filter(user=request.user, is_active=True),
+            "categories": categories,
+            "accounts": [acc for acc in accounts if acc.is_active],
             "today_date": date.today().strftime("%Y-%m-%d"),
             "title": "Add Expense",
         },
@@ -158,14 +211,19 @@ def edit_expense(request, pk):
     if request.method == "POST":
         try:
             with transaction.atomic():
-                new_amount = float(request.POST.get("amount"))
-                old_amount = float(expense.amount)
-
-                # Update logic: adjust balance by the difference
-                if new_amount > old_amount:
-                    expense.account.withdraw(new_amount - old_amount)
-                elif new_amount < old_amount:
-                    expense.account.deposit(old_amount - new_amount)
+                new_amount = as_decimal(request.POST.get("amount"))
+                # Adjust the balance by the difference in SQL, so a concurrent
+                # write to the same account is not overwritten. Both sides are
+                # coerced as Expense.save does when it debits the account
+                difference = new_amount - as_decimal(expense.amount)
+                if difference:
+                    account_qs = Account.objects.filter(pk=expense.account_id)
+                    if difference > 0:
+                        account_qs = account_qs.filter(balance__gte=difference)
+                    if not account_qs.update(balance=F("balance") - difference):
+                        raise ValidationError(
+                            f"Insufficient funds in {expense.account.name}."
+                        )
 
                 expense.title = request.POST.get("title")
                 expense.amount = new_amount
@@ -183,21 +241,36 @@ def edit_expense(request, pk):
                     else "none"
                 )
 
-                expense.save()
+                expense.save(
+                    update_fields=[
+                        "title",
+                        "amount",
+                        "category",
+                        "date_spent",
+                        "tags",
+                        "notes",
+                        "is_recurring",
+                        "recurring_interval",
+                    ]
+                )
+                # Title/category edits change the cached lists too
+                clear_finance_cache(request.user.id)
                 messages.success(request, "Expense updated and balance adjusted!")
                 return redirect("expense_list")
         except ValidationError as e:
             messages.error(request, str(e))
+        except (InvalidOperation, TypeError):
+            messages.error(request, "Please enter a valid number for the amount.")
 
+    categories = user_choices(request, "expense_categories")
+    accounts = user_choices(request, "accounts")
     return render(
         request,
         "expenses/expense_form.html",
         {
             "expense": expense,
-            "categories": Category.objects.filter(
-                user=request.user, category_type="expense"
-            ),
-            "accounts": Account.objects.filter(user=request.user),
+            "categories": categories,
+            "accounts": accounts,
             "title": "Edit Expense",
             "today_date": date.today().strftime("%Y-%m-%d"),
         },
@@ -211,7 +284,7 @@ def delete_expense(request, pk):
         with transaction.atomic():
             expense.account.deposit(expense.amount)
             expense.is_active = False
-            expense.save()
+            expense.save(update_fields=["is_active"])
             messages.success(request, "Expense removed and amount refunded to account.")
             return redirect("expense_list")
 
@@ -29,7 +29,6 @@ class IncomeForm(forms.ModelForm):
         }
 
     def clean_amount(self):
-        print("he")
         amount = self.cleaned_data.get("amount")
         if amount <= 0:
             raise forms.ValidationError("Amount must be greater than zero.")
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 10:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_userfinancesummary'),
+        ('dashboard', '0001_initial'),
+        ('income', '0002_remove_income_payment_method_income_account'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['user', 'is_active', 'date_received'], name='income_inco_user_id_aa276e_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 10:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_userfinancesummary'),
+        ('dashboard', '0001_initial'),
+        ('income', '0003_income_income_inco_user_id_aa276e_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='income',
+            name='income_inco_user_id_aa276e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-date_received'], name='income_active_user_date'),
+        ),
+    ]
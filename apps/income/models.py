@@ -38,14 +38,20 @@ class Income(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Partial index: the ORM emits a bare "is_active" test, which SQLite
+        # only matches against an index condition, not an index column
+        indexes = [
+            models.Index(
+                fields=["user", "-date_received"],
+                condition=models.Q(is_active=True),
+                name="income_active_user_date",
+            )
+        ]
+
     def __str__(self):
         return f"{self.source} - {self.amount}"
 
     @property
     def transaction_date(self):
         return self.date_received
-
-    def save(self, *args, **kwargs):
-        if not self.pk:
-            self.account.deposit(self.amount)
-        super().save(*args, **kwargs)
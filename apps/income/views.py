@@ -2,17 +2,48 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils import timezone
-from django.db.models import Sum
+from django.db.models import F, Sum
 from django.db import transaction
-from django.core.paginator import Paginator
 from decimal import Decimal
-import pandas as pd
-import plotly.express as px
-import plotly.offline as opy
-from datetime import timedelta
 
 from .models import Income, Category
-from apps.accounts.models import Account
+from apps.accounts.models import Account, clear_finance_cache
+from apps.dashboard.utils import (
+    CachedCountPaginator,
+    cached_chart,
+    filter_period,
+    period_range,
+    search_filter,
+)
+
+
+def _filtered_incomes(request):
+    income_qs = (
+        Income.objects.filter(user=request.user, is_active=True)
+        .select_related("category", "account")
+        .only(
+            "source",
+            "amount",
+            "date_received",
+            "is_recurring",
+            "recurring_interval",
+            "category__name",
+            "account__name",
+        )
+        .order_by("-date_received")
+    )
+
+    period = request.GET.get("period", "this_month")
+    start_date, stop_date = period_range(period, timezone.now().date())
+    income_qs = filter_period(income_qs, "date_received", start_date, stop_date)
+
+    query = request.GET.get("q")
+    category_id = request.GET.get("category")
+    if query:
+        income_qs = search_filter(income_qs, "source", query)
+    if category_id:
+        income_qs = income_qs.filter(category_id=category_id)
+    return income_qs, period, query, category_id
 
 
 @login_required
@@ -33,9 +64,14 @@ def income_list_view(request):
                         Category, id=category_id, user=request.user
                     )
                     account_obj = get_object_or_404(
-                        Account, id=account_id, user=request.user
+                        Account.objects.only("name"), id=account_id, user=request.user
                     )
 
+                    # Income.save doesn't touch balances; credit the account
+                    # here, inside the same transaction, with one UPDATE
+                    Account.objects.filter(pk=account_obj.pk).update(
+                        balance=F("balance") + amount
+                    )
                     Income.objects.create(
                         user=request.user,
                         source=source,
@@ -46,6 +82,7 @@ def income_list_view(request):
                         is_recurring=is_recurring,
                         recurring_interval=recurring_interval,
                     )
+                    clear_finance_cache(request.user.id)
                     messages.success(
                         request, f"NPR {amount} added to {account_obj.name}"
                     )
@@ -57,102 +94,96 @@ def income_list_view(request):
         except Exception as e:
             messages.error(request, f"Error: {str(e)}")
 
-    income_qs = (
-        Income.objects.filter(user=request.user, is_active=True)
-        .select_related("category", "account")
-        .order_by("-date_received")
+    # --- 3. PERIOD, SEARCH & CATEGORY FILTERS ---
+    income_qs, period, query, category_id = _filtered_incomes(request)
+
+    # --- 4. PAGINATION ---
+    # Charts are loaded separately by income_charts once the page is shown
+    paginator = CachedCountPaginator(
+        income_qs, 10, request.user.id, ("income", period, query, category_id)
     )
+    page_obj = paginator.get_page(request.GET.get("page"))
 
-    period = request.GET.get("period", "this_month")
-    today = timezone.now().date()
+    context = {
+        "incomes": page_obj,
+        "total_income": income_qs.aggregate(Sum("amount"))["amount__sum"] or 0,
+        "today_date": timezone.now().date().strftime("%Y-%m-%d"),
+        "search_query": query or "",
+        "selected_category": category_id,
+        "current_period": period,
+    }
+    return render(
+        request,
+        "income/income_page.html",
+        context,
+    )
 
-    if period == "last_week":
-        income_qs = income_qs.filter(date_received__gte=today - timedelta(days=7))
-    elif period == "this_month":
-        income_qs = income_qs.filter(
-            date_received__year=today.year, date_received__month=today.month
-        )
-    elif period == "last_month":
-        first_day_this_month = today.replace(day=1)
-        last_day_last_month = first_day_this_month - timedelta(days=1)
-        income_qs = income_qs.filter(
-            date_received__year=last_day_last_month.year,
-            date_received__month=last_day_last_month.month,
-        )
-    elif period == "last_year":
-        income_qs = income_qs.filter(date_received__year=today.year - 1)
 
-    # --- 3. SEARCH & CATEGORY FILTERS ---
-    query = request.GET.get("q")
-    category_id = request.GET.get("category")
-    if query:
-        income_qs = income_qs.filter(source__icontains=query)
-    if category_id:
-        income_qs = income_qs.filter(category_id=category_id)
+@login_required
+def income_charts(request):
+    import plotly.express as px
+
+    income_qs, period, query, category_id = _filtered_incomes(request)
 
-    # --- 4. CHART GENERATION (FIXED TYPES) ---
     chart_trend, chart_pie = None, None
-    if income_qs.exists():
-        df = pd.DataFrame(
-            list(income_qs.values("amount", "category__name", "date_received"))
+    # Per-day and per-category sums come straight from the DB, and the
+    # rendered divs are cached against those sums
+    daily = list(
+        income_qs.values_list("date_received")
+        .annotate(total=Sum("amount"))
+        .values_list("date_received", "total")
+        .order_by("date_received")
+    )
+    if daily:
+        by_category = list(
+            income_qs.values_list("category__name")
+            .annotate(total=Sum("amount"))
+            .values_list("category__name", "total")
+            .order_by()
         )
 
-        # FIX: Force amount to float for Plotly compatibility
-        df["amount"] = df["amount"].astype(float)
-        df["date_received"] = pd.to_datetime(df["date_received"])
-
         # Trend Chart
-        trend_df = (
-            df.groupby("date_received")["amount"]
-            .sum()
-            .reset_index()
-            .sort_values("date_received")
-        )
-        fig_trend = px.area(
-            trend_df,
-            x="date_received",
-            y="amount",
-            title="Income Flow",
-            color_discrete_sequence=["#198754"],
-            template="plotly_white",
-        )
-        fig_trend.update_layout(
-            margin=dict(l=10, r=10, t=30, b=10), height=300, xaxis_title=None
-        )
-        chart_trend = opy.plot(fig_trend, auto_open=False, output_type="div")
+        def build_trend():
+            fig_trend = px.area(
+                x=[day for day, _ in daily],
+                y=[float(total) for _, total in daily],
+                labels={"x": "date_received", "y": "amount"},
+                title="Income Flow",
+                color_discrete_sequence=["#198754"],
+                template="plotly_white",
+            )
+            fig_trend.update_layout(
+                margin=dict(l=10, r=10, t=30, b=10), height=300, xaxis_title=None
+            )
+            return fig_trend.to_html(
+                full_html=False, include_plotlyjs=False, div_id="income-trend"
+            )
 
         # Pie Chart
-        fig_pie = px.pie(
-            df,
-            values="amount",
-            names="category__name",
-            title="Income Sources",
-            hole=0.4,
-            color_discrete_sequence=px.colors.sequential.Greens_r,
-        )
-        fig_pie.update_layout(margin=dict(l=10, r=10, t=30, b=10), height=300)
-        chart_pie = opy.plot(fig_pie, auto_open=False, output_type="div")
+        def build_pie():
+            fig_pie = px.pie(
+                names=[name for name, _ in by_category],
+                values=[float(total) for _, total in by_category],
+                labels={"names": "category__name", "values": "amount"},
+                title="Income Sources",
+                hole=0.4,
+                color_discrete_sequence=px.colors.sequential.Greens_r,
+            )
+            fig_pie.update_layout(margin=dict(l=10, r=10, t=30, b=10), height=300)
+            return fig_pie.to_html(
+                full_html=False, include_plotlyjs=False, div_id="income-pie"
+            )
 
-    # --- 5. PAGINATION ---
-    paginator = Paginator(income_qs, 10)
-    page_obj = paginator.get_page(request.GET.get("page"))
+        chart_key = f"{request.user.id}:{period}:{query}:{category_id}"
+        chart_trend = cached_chart(
+            f"inc_trend:{chart_key}", repr(daily).encode(), build_trend
+        )
+        chart_pie = cached_chart(
+            f"inc_pie:{chart_key}", repr(by_category).encode(), build_pie
+        )
 
-    context = {
-        "incomes": page_obj,
-        "categories": Category.objects.filter(
-            user=request.user, category_type="income"
-        ),
-        "accounts": Account.objects.filter(user=request.user, is_active=True),
-        "chart_trend": chart_trend,
-        "chart_pie": chart_pie,
-        "total_income": income_qs.aggregate(Sum("amount"))["amount__sum"] or 0,
-        "today_date": today.strftime("%Y-%m-%d"),
-        "search_query": query or "",
-        "selected_category": category_id,
-        "current_period": period,
-    }
     return render(
         request,
-        "income/income_page.html",
-        context,
+        "income/income_charts.html",
+        {"chart_trend": chart_trend, "chart_pie": chart_pie},
     )
@@ -1,8 +1,25 @@
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import F
+
+from apps.accounts.models import Account, clear_finance_cache
 from apps.income.models import Income
 from apps.expenses.models import Expense
 # Register your models here.
 
 
-admin.site.register(Income)
+class IncomeAdmin(admin.ModelAdmin):
+    def save_model(self, request, obj, form, change):
+        # Income.save doesn't credit the account, so new rows do it here
+        with transaction.atomic():
+            if not change:
+                Account.objects.filter(pk=obj.account_id).update(
+                    balance=F("balance") + obj.amount
+                )
+            super().save_model(request, obj, form, change)
+        if not change:
+            clear_finance_cache(obj.account.user_id)
+
+
+admin.site.register(Income, IncomeAdmin)
 admin.site.register(Expense)
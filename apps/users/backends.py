@@ -0,0 +1,26 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models.functions import Lower
+
+
+def users_by_email(email):
+    # Matches the user_email_ci index on LOWER(email)
+    return (
+        get_user_model()
+        .objects.annotate(email_ci=Lower("email"))
+        .filter(email_ci=(email or "").lower())
+    )
+
+
+class EmailBackend(ModelBackend):
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None or password is None:
+            return None
+        user = users_by_email(email).order_by("pk").first()
+        if user is None:
+            # Run the hasher anyway so a missing email takes as long as a bad password
+            get_user_model()().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
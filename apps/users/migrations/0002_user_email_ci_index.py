@@ -0,0 +1,23 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+EMAIL_INDEX = models.Index(Lower("email"), name="user_email_ci")
+
+
+def add_email_index(apps, schema_editor):
+    schema_editor.add_index(apps.get_model("auth", "User"), EMAIL_INDEX)
+
+
+def remove_email_index(apps, schema_editor):
+    schema_editor.remove_index(apps.get_model("auth", "User"), EMAIL_INDEX)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_email_index, remove_email_index),
+    ]
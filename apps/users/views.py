@@ -2,6 +2,10 @@ from django.shortcuts import render, redirect
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate, login as auth_login, logout as auth_logout
 from django.contrib import messages
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .backends import users_by_email
 
 
 def login_view(request):  # Renamed to avoid conflict with auth_login
@@ -9,17 +13,14 @@ def login_view(request):  # Renamed to avoid conflict with auth_login
         email = request.POST.get("email")
         password = request.POST.get("password")
 
-        user_obj = User.objects.filter(email=email).first()
-        print(email)
-
-        if user_obj:
-            user = authenticate(request, username=user_obj.username, password=password)
-            if user is not None:
-                auth_login(request, user)
-                messages.success(request, f"Welcome back, {user.username}!")
-                return redirect("dashboard")
-            else:
-                messages.error(request, "Invalid password.")
+        # One lookup by email; the existence check only runs on failure
+        user = authenticate(request, email=email, password=password)
+        if user is not None:
+            auth_login(request, user)
+            messages.success(request, f"Welcome back, {user.username}!")
+            return redirect("dashboard")
+        elif users_by_email(email).exists():
+            messages.error(request, "Invalid password.")
         else:
             messages.error(request, "No account found with this email.")
 
@@ -37,11 +38,17 @@ def registration_view(request):
             messages.error(request, "The two passwords do not match.")
             return render(request, "users/registration.html")
 
-        if User.objects.filter(username=username).exists():
+        # Username and email clashes come back from a single query
+        taken = list(
+            User.objects.annotate(email_ci=Lower("email"))
+            .filter(Q(username=username) | Q(email_ci=(email or "").lower()))
+            .values_list("username", flat=True)[:2]
+        )
+        if username in taken:
             messages.error(request, "This username is already taken.")
             return render(request, "users/registration.html")
 
-        if User.objects.filter(email=email).exists():
+        if taken:
             messages.error(request, "An account with this email already exists.")
             return render(request, "users/registration.html")
 
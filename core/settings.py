@@ -51,6 +51,8 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "apps.accounts.context.user_sidebar",
+                "apps.dashboard.context.plotly",
             ],
         },
     },
@@ -59,7 +61,21 @@ TEMPLATES = [
 WSGI_APPLICATION = "core.wsgi.application"
 
 # --- DATABASE ---
-DATABASES = {"default": sqlite_config(BASE_DIR)}
+# dj_lite already sets WAL, synchronous=NORMAL and temp_store=MEMORY through
+# init_command; map 256 MiB of the file and keep a 64 MiB page cache
+DATABASES = {
+    "default": sqlite_config(BASE_DIR, mmap_size=268435456, cache_size=-64000)
+}
+
+# --- CACHE ---
+# Per-user finance figures are invalidated by deleting their keys, so every
+# worker process has to see the same cache; a file cache is shared on one host
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": config("CACHE_DIR", default=str(BASE_DIR / ".django_cache")),
+    }
+}
 
 # --- PASSWORD VALIDATION ---
 AUTH_PASSWORD_VALIDATORS = [
@@ -103,6 +119,12 @@ WHITENOISE_USE_FINDERS = True  # Better compatibility with some Windows setups
 # --- MISC ---
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# AUTHENTICATION
+AUTHENTICATION_BACKENDS = [
+    "django.contrib.auth.backends.ModelBackend",  # Admin (username) logins
+    "apps.users.backends.EmailBackend",
+]
+
 # AUTHENTICATION URLS
 LOGIN_URL = "/users/login"
 LOGIN_REDIRECT_URL = "/dashboard/"
@@ -31,7 +31,9 @@ urlpatterns = [
     path("export/", d_views.export_report_pdf, name="export_pdf"),
     path("dashboard/export/", d_views.export_report_csv, name="export_report"),
     path("income/", inc_views.income_list_view, name="income_page"),
+    path("income/charts/", inc_views.income_charts, name="income_charts"),
     path("expenses/list/", exp_views.expense_list, name="expense_list"),
+    path("expenses/charts/", exp_views.expense_charts, name="expense_charts"),
     path("expenses/add/", exp_views.add_expense, name="add_expense"),
     path("expenses/edit/<int:pk>/", exp_views.edit_expense, name="edit_expense"),
     path("expenses/delete/<int:pk>/", exp_views.delete_expense, name="delete_expense"),